@@ -3,9 +3,11 @@ Database configuration and models for collaborative drawing board.
 Uses SQLAlchemy with in-memory SQLite for testing and performance.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, LargeBinary, Float
+from sqlalchemy import create_engine, event, inspect, text, BigInteger, Column, Index, Integer, String, DateTime, Boolean, Text, ForeignKey, LargeBinary, Float
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime, timezone
+import calendar
 import os
 
 # Use SQLite file for persistence during testing
@@ -17,6 +19,13 @@ engine_kwargs = {
     "pool_recycle": 300,
 }
 
+if ":memory:" not in DATABASE_URL:
+    # Headroom for the concurrent cleanup workers alongside request sessions
+    engine_kwargs.update({
+        "pool_size": 10,
+        "max_overflow": 5,
+    })
+
 if "sqlite" in DATABASE_URL:
     engine_kwargs.update({
         "connect_args": {
@@ -27,10 +36,56 @@ if "sqlite" in DATABASE_URL:
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 
+if "sqlite" in DATABASE_URL:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Tune each new SQLite connection for batched TTL cleanup.
+        
+        WAL with synchronous=NORMAL only fsyncs at checkpoints instead of on
+        every commit, which keeps per-batch cleanup commits cheap and lets
+        readers proceed while cleanup writes.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class EpochSeconds(TypeDecorator):
+    """
+    TTL timestamp stored as BIGINT Unix epoch seconds.
+    
+    Expiry columns are compared against a cutoff on every cleanup run. Storing
+    them as integers keeps the comparison a plain range scan on the index,
+    instead of SQLite parsing TEXT datetimes (or wrapping the column in
+    strftime('%s', ...), which disables the index).
+    
+    Python code keeps working with naive UTC datetimes; integer epoch values
+    are also accepted as bind parameters. Sub-second precision is truncated.
+    BIGINT keeps PostgreSQL clear of the 32-bit overflow in January 2038
+    (SQLite stores both the same way).
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        if value.tzinfo is not None:
+            return int(value.timestamp())
+        return calendar.timegm(value.timetuple())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
 class User(Base):
     """
     User model for authentication and collaboration.
@@ -159,11 +214,20 @@ class Stroke(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Null for anonymous
     stroke_data = Column(LargeBinary, nullable=False)  # Encrypted stroke path data
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    # TTL enforcement (epoch seconds); indexed by idx_strokes_expires_board below
+    expires_at = Column(EpochSeconds, nullable=False)
     
     # Relationships
     board = relationship("Board")
     user = relationship("User")
+    
+    __table_args__ = (
+        # TTL sweeps range-scan expires_at; board_id rides along so per-board
+        # expiry counts are answered from the index without touching the table.
+        # Leading with expires_at, it also serves every expires_at-only lookup,
+        # so the column carries no separate single-column index.
+        Index("idx_strokes_expires_board", "expires_at", "board_id"),
+    )
 
 
 class FileUpload(Base):
@@ -180,12 +244,12 @@ class FileUpload(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     filename = Column(String(255), nullable=False)
-    file_path = Column(Text, nullable=False)
+    file_path = Column(Text, nullable=False, index=True)  # Indexed for orphaned file reconciliation
     file_size = Column(Integer, nullable=False)
     mime_type = Column(String(100), nullable=False)
     upload_type = Column(String(50), nullable=False, index=True)  # 'temporary', 'template', 'avatar'
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    expires_at = Column(EpochSeconds, nullable=False, index=True)  # TTL enforcement (epoch seconds)
     
     # Relationships
     user = relationship("User")
@@ -208,7 +272,7 @@ class BoardTemplate(Base):
     usage_count = Column(Integer, default=0)
     last_used_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    expires_at = Column(EpochSeconds, nullable=False, index=True)  # TTL enforcement (epoch seconds)
     
     # Relationships
     creator = relationship("User")
@@ -250,10 +314,10 @@ class UserAvatar(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
     image_url = Column(Text, nullable=False)
-    file_path = Column(Text, nullable=False)
+    file_path = Column(Text, nullable=False, index=True)  # Indexed for orphaned file reconciliation
     file_size = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    expires_at = Column(EpochSeconds, nullable=False, index=True)  # TTL enforcement (epoch seconds)
     
     # Relationships
     user = relationship("User")
@@ -275,7 +339,7 @@ class UserPresence(Base):
     last_seen = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    expires_at = Column(EpochSeconds, nullable=False, index=True)  # TTL enforcement (epoch seconds)
     
     # Relationships
     user = relationship("User")
@@ -298,7 +362,7 @@ class LoginHistory(Base):
     ip_address = Column(String(45), nullable=False, index=True)  # IPv4/IPv6
     user_agent = Column(Text, nullable=True)
     success = Column(Boolean, nullable=False, default=True)
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    expires_at = Column(EpochSeconds, nullable=False, index=True)  # TTL enforcement (epoch seconds)
     
     # Relationships
     user = relationship("User")
@@ -320,7 +384,7 @@ class EditHistory(Base):
     action_type = Column(String(50), nullable=False, index=True)  # 'stroke', 'erase', 'clear', etc.
     action_data = Column(Text, nullable=False)  # JSON action details
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
-    expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
+    expires_at = Column(EpochSeconds, nullable=False, index=True)  # TTL enforcement (epoch seconds)
     
     # Relationships
     board = relationship("Board")
@@ -336,6 +400,59 @@ def get_db():
         db.close()
 
 
+def migrate_expires_at_to_epoch_seconds(bind=engine):
+    """
+    Convert legacy expiry columns to BIGINT epoch seconds in place.
+    
+    Databases created before expiry columns became EpochSeconds still hold
+    DATETIME values. On SQLite those compare greater than any integer cutoff
+    (so the rows never expire); on PostgreSQL the column type no longer
+    matches, and columns created as INTEGER are widened to BIGINT. Fractional
+    seconds are floored, matching EpochSeconds on insert. Tables and columns
+    that are already converted are left alone, so reruns are harmless.
+    
+    This is a one-off upgrade step, not part of create_tables(); run it with
+    ``python -m app.database`` against a database created by an older release.
+    
+    Args:
+        bind: Engine or connection to migrate (the application engine by default)
+    """
+    epoch_columns = [
+        (table.name, column.name)
+        for table in Base.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, EpochSeconds)
+    ]
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table_name, column_name in epoch_columns:
+            if not inspector.has_table(table_name):
+                continue
+            if conn.dialect.name == "postgresql":
+                column_types = {column["name"]: column["type"] for column in inspector.get_columns(table_name)}
+                column_type = column_types[column_name]
+                if isinstance(column_type, BigInteger):
+                    continue
+                if isinstance(column_type, Integer):
+                    using = column_name
+                else:
+                    using = f"floor(EXTRACT(EPOCH FROM {column_name}))"
+                conn.execute(text(
+                    f"ALTER TABLE {table_name} ALTER COLUMN {column_name} TYPE BIGINT "
+                    f"USING {using}::bigint"
+                ))
+            else:
+                # DATETIME values were stored as naive UTC 'YYYY-MM-DD HH:MM:SS' text
+                conn.execute(text(
+                    f"UPDATE {table_name} SET {column_name} = CAST(strftime('%s', {column_name}) AS INTEGER) "
+                    f"WHERE typeof({column_name}) = 'text'"
+                ))
+
+
 def create_tables():
     """Create database tables."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+
+
+if __name__ == "__main__":
+    migrate_expires_at_to_epoch_seconds()
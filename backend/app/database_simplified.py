@@ -67,6 +67,8 @@ class User(Base):
     
     # Relationships
     owned_boards = relationship("Board", back_populates="owner", cascade="all, delete-orphan")
+    activities = relationship("ActivityLog", back_populates="user")
+    files = relationship("FileUpload", back_populates="user")
 
 
 class Board(Base):
@@ -133,7 +135,7 @@ class FileUpload(Base):
     last_used_at = Column(DateTime, nullable=True)  # For template cleanup decisions
     
     # Relationships
-    user = relationship("User")
+    user = relationship("User", back_populates="files")
     board = relationship("Board")
 
 
@@ -157,7 +159,7 @@ class ActivityLog(Base):
     expires_at = Column(DateTime, nullable=False, index=True)  # TTL enforcement
     
     # Relationships
-    user = relationship("User")
+    user = relationship("User", back_populates="activities")
     board = relationship("Board")
 
 
@@ -3,9 +3,10 @@ Security module for end-to-end encryption using AES-GCM.
 All drawing data must be encrypted before storage and transmission.
 """
 
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, Union
 import base64
 import os
+import orjson
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.exceptions import InvalidTag
 
@@ -18,18 +19,20 @@ class DrawingEncryption:
         self.key = key or AESGCM.generate_key(bit_length=256)
         self.aesgcm = AESGCM(self.key)
     
-    def encrypt_drawing_data(self, drawing_data: str) -> Tuple[str, str]:
+    def encrypt_drawing_data(self, drawing_data: Union[str, bytes]) -> Tuple[str, str]:
         """
         Encrypt drawing data using AES-GCM.
         
         Args:
-            drawing_data: JSON string of drawing data
+            drawing_data: JSON drawing data, as a string or already-encoded UTF-8 bytes
             
         Returns:
             Tuple of (encrypted_data_base64, nonce_base64)
         """
         nonce = os.urandom(12)  # 96-bit nonce for GCM
-        encrypted_data = self.aesgcm.encrypt(nonce, drawing_data.encode('utf-8'), None)
+        if isinstance(drawing_data, str):
+            drawing_data = drawing_data.encode('utf-8')
+        encrypted_data = self.aesgcm.encrypt(nonce, drawing_data, None)
         
         return (
             base64.b64encode(encrypted_data).decode('ascii'),
@@ -56,6 +59,49 @@ class DrawingEncryption:
         decrypted_data = self.aesgcm.decrypt(nonce, encrypted_data, None)
         return decrypted_data.decode('utf-8')
     
+    def encrypt_operations_batch(self, operations: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Encrypt a batch of drawing operations.
+        
+        Every operation is sealed with the instance's single AES-GCM context
+        (OpenSSL's hardware-accelerated EVP path) under its own random nonce,
+        so no cipher setup is repeated per operation.
+        
+        Args:
+            operations: JSON-serializable drawing operations
+            
+        Returns:
+            List of (encrypted_data_base64, nonce_base64) tuples, in input order
+        """
+        encrypt = self.aesgcm.encrypt
+        encrypted_batch = []
+        for operation in operations:
+            nonce = os.urandom(12)  # 96-bit nonce for GCM, never reused within a batch
+            encrypted_batch.append((
+                base64.b64encode(encrypt(nonce, orjson.dumps(operation), None)).decode('ascii'),
+                base64.b64encode(nonce).decode('ascii')
+            ))
+        return encrypted_batch
+    
+    def decrypt_operations_batch(self, encrypted_batch: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Decrypt a batch produced by encrypt_operations_batch.
+        
+        Args:
+            encrypted_batch: List of (encrypted_data_base64, nonce_base64) tuples
+            
+        Returns:
+            Decrypted drawing operations, in input order
+            
+        Raises:
+            InvalidTag: If authentication fails for any operation
+        """
+        decrypt = self.aesgcm.decrypt
+        return [
+            orjson.loads(decrypt(base64.b64decode(nonce_b64), base64.b64decode(encrypted_data_b64), None))
+            for encrypted_data_b64, nonce_b64 in encrypted_batch
+        ]
+    
     def get_key_b64(self) -> str:
         """Get the encryption key as base64 string."""
         return base64.b64encode(self.key).decode('ascii')
@@ -26,6 +26,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 
 from app.services.data_expiration import DataExpirationService, CleanupResult
+from app.services.storage_manager import StorageManager
 from app.database import SessionLocal
 
 
@@ -64,14 +65,16 @@ class CleanupScheduler:
     and configurable execution schedules.
     """
 
-    def __init__(self, config: SchedulerConfig = None):
+    def __init__(self, config: SchedulerConfig = None, storage_manager: StorageManager = None):
         """
         Initialize CleanupScheduler.
         
         Args:
             config: Scheduler configuration (uses defaults if None)
+            storage_manager: StorageManager for filesystem cleanup (created on demand if None)
         """
         self.config = config or SchedulerConfig()
+        self.storage_manager = storage_manager
         self.scheduler = AsyncIOScheduler()
         self.cleanup_handler: Optional[Callable] = None
         self.execution_history: Dict[str, JobExecutionResult] = {}
@@ -241,7 +244,8 @@ class CleanupScheduler:
                     args=[job_id, result.retry_count + 1],
                     id=f"retry_{job_id}_{result.retry_count + 1}",
                     name=f"Retry cleanup {result.retry_count + 1}",
-                    max_instances=1
+                    max_instances=1,
+                    coalesce=True
                 )
         
         # Store execution history
@@ -434,25 +438,23 @@ class CleanupScheduler:
         db = SessionLocal()
         try:
             service = DataExpirationService(db)
+            storage = self.storage_manager or StorageManager()
             
-            # Execute database cleanup
-            database_result = await service.cleanup_expired_data_async()
-            
-            # Execute filesystem cleanup (would integrate with StorageManager)
-            # For now, simulate filesystem cleanup success
-            filesystem_result = {
-                "success": True,
-                "freed_bytes": 0
-            }
+            # Database and filesystem cleanup are independent, so run them concurrently
+            database_result, filesystem_result = await asyncio.gather(
+                service.cleanup_expired_data_async(),
+                storage.cleanup_expired_files_async()
+            )
             
             return {
                 "database_cleanup_success": database_result.success,
-                "filesystem_cleanup_success": filesystem_result["success"],
-                "total_freed_bytes": database_result.freed_memory_bytes + database_result.freed_storage_bytes + filesystem_result["freed_bytes"],
+                "filesystem_cleanup_success": filesystem_result.success,
+                "total_freed_bytes": database_result.freed_memory_bytes + database_result.freed_storage_bytes + filesystem_result.freed_bytes,
                 "database_deleted_count": database_result.deleted_count,
+                "filesystem_deleted_count": filesystem_result.deleted_files_count,
                 "database_errors": database_result.error_count,
                 "execution_time_ms": database_result.execution_time_ms
             }
             
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
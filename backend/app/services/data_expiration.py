@@ -18,11 +18,13 @@ Features:
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, delete, func, text
+from sqlalchemy import and_, bindparam, delete, func, insert, literal, select, text
 
 from app.database import (
     Stroke, FileUpload, BoardTemplate, DataCleanupJob, UserAvatar,
@@ -33,6 +35,66 @@ from app.database import (
 logger = logging.getLogger(__name__)
 
 
+# Stroke cleanup statements, built once per process and keyed by user_type.
+# Only the cutoff is bound at call time, so repeated cleanups reuse the same
+# compiled statement instead of assembling a new ORM query each run.
+_STROKE_USER_FILTERS = {
+    "anonymous": [Stroke.user_id.is_(None)],
+    "registered": [Stroke.user_id.isnot(None)],
+    "all": [],
+}
+
+
+def _stroke_filter_key(user_type: str) -> str:
+    """Map a user_type to its statement key; unknown types clean all strokes."""
+    return user_type if user_type in _STROKE_USER_FILTERS else "all"
+
+
+def _expired_stroke_criteria(user_type: str) -> list:
+    """Build the WHERE criteria for expired strokes of the given user type."""
+    return [Stroke.expires_at <= bindparam("cutoff")] + _STROKE_USER_FILTERS[user_type]
+
+
+EXPIRED_STROKE_BYTES = {
+    user_type: select(
+        func.coalesce(func.sum(func.length(Stroke.stroke_data)), 0)
+    ).where(*_expired_stroke_criteria(user_type))
+    for user_type in _STROKE_USER_FILTERS
+}
+
+# Strokes are deleted in bounded primary-key batches rather than one predicate
+# DELETE, so the write lock is only held for one batch at a time and
+# concurrent board writes can proceed between batches. On PostgreSQL the
+# victim rows are claimed with FOR UPDATE SKIP LOCKED, so concurrent cleanups
+# split the work instead of queueing on each other's row locks (SQLite has no
+# row locks and renders no locking clause).
+def _delete_expired_stroke_batch(*criteria):
+    """Build a DELETE of one primary-key batch of strokes matching ``criteria``."""
+    return delete(Stroke).where(
+        Stroke.id.in_(
+            select(Stroke.id).where(
+                *criteria
+            ).limit(bindparam("batch_size")).with_for_update(skip_locked=True).scalar_subquery()
+        )
+    ).execution_options(synchronize_session=False)
+
+
+DELETE_EXPIRED_STROKE_BATCH = {
+    user_type: _delete_expired_stroke_batch(*_expired_stroke_criteria(user_type))
+    for user_type in _STROKE_USER_FILTERS
+}
+
+# Same batches restricted to a single board, for per-board cleanup runs
+DELETE_EXPIRED_BOARD_STROKE_BATCH = {
+    user_type: _delete_expired_stroke_batch(
+        *_expired_stroke_criteria(user_type), Stroke.board_id == bindparam("board_id")
+    )
+    for user_type in _STROKE_USER_FILTERS
+}
+
+DELETE_BATCH_SIZE = 1000
+
+
 @dataclass
 class TTLPolicy:
     """
@@ -84,6 +146,7 @@ class CleanupResult:
     freed_memory_bytes: int = 0
     freed_storage_bytes: int = 0
     execution_time_ms: int = 0
+    execution_time_ns: int = 0
     error_count: int = 0
     error_message: Optional[str] = None
     rollback_performed: bool = False
@@ -93,6 +156,11 @@ class CleanupResult:
         if self.log_entries is None:
             self.log_entries = []
 
+    def record_execution_time(self, start_ns: int):
+        """Set execution time from a ``time.perf_counter_ns()`` start mark."""
+        self.execution_time_ns = time.perf_counter_ns() - start_ns
+        self.execution_time_ms = self.execution_time_ns // 1_000_000
+
 
 @dataclass
 class NotificationResult:
@@ -104,6 +172,58 @@ class NotificationResult:
     failed_notifications: int = 0
 
 
+# TTL policies are static configuration: built once and shared read-only
+# by every service instance instead of being reconstructed per request.
+DEFAULT_TTL_POLICIES: Mapping[str, TTLPolicy] = MappingProxyType({
+    "anonymous_strokes": TTLPolicy(
+        data_type="anonymous_strokes",
+        ttl_hours=24,
+        grace_period_hours=1,
+        user_tier_multipliers={"anonymous": 1.0}
+    ),
+    "registered_strokes": TTLPolicy(
+        data_type="registered_strokes", 
+        ttl_hours=24 * 30,  # 30 days
+        grace_period_hours=1
+    ),
+    "unused_templates": TTLPolicy(
+        data_type="unused_templates",
+        ttl_hours=24 * 7,  # 7 days
+        grace_period_hours=1
+    ),
+    "temporary_uploads": TTLPolicy(
+        data_type="temporary_uploads",
+        ttl_hours=1,
+        grace_period_hours=0  # No grace period for temp files
+    ),
+    "board_exports": TTLPolicy(
+        data_type="board_exports",
+        ttl_hours=48,
+        grace_period_hours=1
+    ),
+    "user_avatars": TTLPolicy(
+        data_type="user_avatars",
+        ttl_hours=24 * 30,  # 30 days
+        grace_period_hours=1
+    ),
+    "user_presence": TTLPolicy(
+        data_type="user_presence",
+        ttl_hours=1,
+        grace_period_hours=0
+    ),
+    "login_history": TTLPolicy(
+        data_type="login_history",
+        ttl_hours=24 * 90,  # 90 days for compliance
+        grace_period_hours=24
+    ),
+    "edit_history": TTLPolicy(
+        data_type="edit_history",
+        ttl_hours=24 * 30,  # 30 days
+        grace_period_hours=1
+    )
+})
+
+
 class DataExpirationService:
     """
     Service for managing TTL-based data expiration and cleanup.
@@ -112,67 +232,34 @@ class DataExpirationService:
     performance tracking, and user notifications.
     """
 
-    def __init__(self, db_session: Session = None):
+    def __init__(self, db_session: Session = None, delete_batch_size: int = DELETE_BATCH_SIZE):
         """
         Initialize DataExpirationService.
         
         Args:
             db_session: Database session for cleanup operations
+            delete_batch_size: Maximum number of strokes deleted per cleanup transaction
         """
         self.db = db_session
+        self.delete_batch_size = delete_batch_size
         self.ttl_policies = self._initialize_ttl_policies()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
-    def _initialize_ttl_policies(self) -> Dict[str, TTLPolicy]:
-        """Initialize default TTL policies for different data types."""
-        return {
-            "anonymous_strokes": TTLPolicy(
-                data_type="anonymous_strokes",
-                ttl_hours=24,
-                grace_period_hours=1,
-                user_tier_multipliers={"anonymous": 1.0}
-            ),
-            "registered_strokes": TTLPolicy(
-                data_type="registered_strokes", 
-                ttl_hours=24 * 30,  # 30 days
-                grace_period_hours=1
-            ),
-            "unused_templates": TTLPolicy(
-                data_type="unused_templates",
-                ttl_hours=24 * 7,  # 7 days
-                grace_period_hours=1
-            ),
-            "temporary_uploads": TTLPolicy(
-                data_type="temporary_uploads",
-                ttl_hours=1,
-                grace_period_hours=0  # No grace period for temp files
-            ),
-            "board_exports": TTLPolicy(
-                data_type="board_exports",
-                ttl_hours=48,
-                grace_period_hours=1
-            ),
-            "user_avatars": TTLPolicy(
-                data_type="user_avatars",
-                ttl_hours=24 * 30,  # 30 days
-                grace_period_hours=1
-            ),
-            "user_presence": TTLPolicy(
-                data_type="user_presence",
-                ttl_hours=1,
-                grace_period_hours=0
-            ),
-            "login_history": TTLPolicy(
-                data_type="login_history",
-                ttl_hours=24 * 90,  # 90 days for compliance
-                grace_period_hours=24
-            ),
-            "edit_history": TTLPolicy(
-                data_type="edit_history",
-                ttl_hours=24 * 30,  # 30 days
-                grace_period_hours=1
-            )
-        }
+    def _initialize_ttl_policies(self) -> Mapping[str, TTLPolicy]:
+        """Return the shared default TTL policies for different data types."""
+        return DEFAULT_TTL_POLICIES
+
+    def get_policy(self, data_type: str) -> TTLPolicy:
+        """
+        Look up the TTL policy for a data type.
+        
+        Args:
+            data_type: Policy key, e.g. "anonymous_strokes"
+            
+        Returns:
+            The shared TTLPolicy instance for that data type
+        """
+        return self.ttl_policies[data_type]
 
     def create_anonymous_session(self) -> Dict[str, Any]:
         """
@@ -181,7 +268,7 @@ class DataExpirationService:
         Returns:
             Session data with expiry information
         """
-        policy = self.ttl_policies["anonymous_strokes"]
+        policy = self.get_policy("anonymous_strokes")
         expires_at = policy.get_expiry_time("anonymous")
         
         # This would integrate with session management
@@ -207,7 +294,7 @@ class DataExpirationService:
         # Get user tier (default to free)
         user_tier = "free"  # Would query from user table
         
-        policy = self.ttl_policies["registered_strokes"]
+        policy = self.get_policy("registered_strokes")
         expires_at = policy.get_expiry_time(user_tier)
         
         stroke_data = {
@@ -219,63 +306,57 @@ class DataExpirationService:
         self.logger.info(f"Created user stroke for user {user_id} expiring at {expires_at}")
         return stroke_data
 
-    def cleanup_expired_strokes(self, user_type: str = "all") -> CleanupResult:
+    def cleanup_expired_strokes(self, user_type: str = "all", cutoff: int = None) -> CleanupResult:
         """
         Clean up expired stroke data.
         
+        Deletion runs in committed batches (see delete_expired_strokes), so a
+        failure part-way keeps the batches already deleted. The job record is
+        written once, when the run has finished or failed.
+        
         Args:
             user_type: Type of strokes to clean ("anonymous", "registered", "all")
+            cutoff: Epoch seconds at or before which strokes are expired (now if None)
             
         Returns:
             CleanupResult with cleanup metrics
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         result = CleanupResult(job_type=f"strokes_{user_type}")
+        job = DataCleanupJob(
+            job_type=f"strokes_{user_type}",
+            started_at=datetime.now(timezone.utc).replace(tzinfo=None)
+        )
         
         try:
-            job = DataCleanupJob(
-                job_type=f"strokes_{user_type}",
-                started_at=start_time
-            )
-            self.db.add(job)
-            self.db.flush()  # Get job ID
-            
-            # Use timezone-naive datetime for SQLite compatibility
-            current_time = datetime.now(timezone.utc).replace(tzinfo=None).replace(tzinfo=None)
-            query = self.db.query(Stroke).filter(Stroke.expires_at <= current_time)
-            
-            if user_type == "anonymous":
-                query = query.filter(Stroke.user_id.is_(None))
-            elif user_type == "registered":
-                query = query.filter(Stroke.user_id.isnot(None))
+            if cutoff is None:
+                cutoff = int(time.time())
+            params = {"cutoff": cutoff}
             
             # Calculate metrics before deletion
-            expired_strokes = query.all()
-            deleted_count = len(expired_strokes)
-            freed_bytes = sum(len(stroke.stroke_data or b'') for stroke in expired_strokes)
+            freed_bytes = self.db.execute(EXPIRED_STROKE_BYTES[_stroke_filter_key(user_type)], params).scalar()
             
             # Perform deletion
-            if deleted_count > 0:
-                query.delete()
+            deleted_count = self.delete_expired_strokes(cutoff, user_type)
                 
             result.deleted_count = deleted_count
             result.freed_memory_bytes = freed_bytes
             result.success = True
             
-            # Update job record
-            job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            # Record the job
+            result.record_execution_time(start_time)
+            job.execution_time_ms = result.execution_time_ms
+            job.completed_at = job.started_at + timedelta(milliseconds=job.execution_time_ms)
             job.status = 'completed'
             job.deleted_count = deleted_count
             job.freed_memory_bytes = freed_bytes
-            job.execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
             
+            self.db.add(job)
             self.db.commit()
             
-            result.execution_time_ms = job.execution_time_ms
             result.log_entries.append(f"Cleanup completed: {deleted_count} strokes deleted")
             
-            self.logger.info(f"Cleanup completed: {deleted_count} {user_type} strokes deleted, "
-                           f"{freed_bytes} bytes freed")
+            self._log_cleanup_completed(result)
                            
         except Exception as e:
             self.db.rollback()
@@ -290,49 +371,91 @@ class DataExpirationService:
             try:
                 job.status = 'failed'
                 job.error_message = str(e)
-                job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None).replace(tzinfo=None)
+                job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+                self.db.add(job)
                 self.db.commit()
             except:
                 pass  # Don't fail cleanup result due to job logging failure
         
         return result
 
-    def cleanup_expired_uploads(self) -> CleanupResult:
+    def delete_expired_strokes(self, cutoff: int, user_type: str = "all",
+                               batch_size: int = None, board_id: int = None) -> int:
+        """
+        Delete expired strokes in primary-key batches.
+        
+        Each batch runs ``DELETE ... WHERE id IN (SELECT id ... LIMIT n)`` and
+        is committed on its own, keeping every write transaction short. Any
+        other pending changes in the session are committed with the first
+        batch.
+        
+        Args:
+            cutoff: Strokes expiring at or before this epoch second are deleted
+            user_type: Type of strokes to delete ("anonymous", "registered", "all")
+            batch_size: Maximum number of strokes deleted per transaction
+                (the service's delete_batch_size if None)
+            board_id: Only delete strokes on this board (all boards if None)
+            
+        Returns:
+            Number of strokes deleted
+        """
+        if batch_size is None:
+            batch_size = self.delete_batch_size
+        params = {"cutoff": cutoff, "batch_size": batch_size}
+        if board_id is None:
+            statement = DELETE_EXPIRED_STROKE_BATCH[_stroke_filter_key(user_type)]
+        else:
+            statement = DELETE_EXPIRED_BOARD_STROKE_BATCH[_stroke_filter_key(user_type)]
+            params["board_id"] = board_id
+        deleted_count = 0
+        while True:
+            batch_count = self.db.execute(statement, params).rowcount
+            deleted_count += batch_count
+            
+            if batch_count:
+                self.db.commit()
+            if batch_count < batch_size:
+                break
+        
+        return deleted_count
+
+    def cleanup_expired_uploads(self, cutoff: int = None) -> CleanupResult:
         """Clean up expired file uploads."""
         return self._cleanup_expired_data(
             FileUpload, 
             "uploads", 
-            size_field="file_size"
+            size_field="file_size",
+            cutoff=cutoff
         )
 
-    def cleanup_expired_templates(self) -> CleanupResult:
+    def cleanup_expired_templates(self, cutoff: int = None) -> CleanupResult:
         """Clean up unused expired templates."""
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         result = CleanupResult(job_type="templates")
         
         try:
-            current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+            if cutoff is None:
+                cutoff = int(time.time())
             
             # Find templates that are expired and haven't been used recently
             query = self.db.query(BoardTemplate).filter(
                 and_(
-                    BoardTemplate.expires_at <= current_time,
+                    BoardTemplate.expires_at <= cutoff,
                     BoardTemplate.usage_count == 0
                 )
             )
             
-            expired_templates = query.all()
-            deleted_count = len(expired_templates)
+            deleted_count = query.count()
             
             if deleted_count > 0:
-                query.delete()
+                query.delete(synchronize_session=False)
                 self.db.commit()
             
             result.deleted_count = deleted_count
             result.success = True
-            result.execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            result.record_execution_time(start_time)
             
-            self.logger.info(f"Template cleanup completed: {deleted_count} templates deleted")
+            self._log_cleanup_completed(result)
             
         except Exception as e:
             self.db.rollback()
@@ -343,36 +466,36 @@ class DataExpirationService:
         
         return result
 
-    def cleanup_expired_exports(self) -> CleanupResult:
+    def cleanup_expired_exports(self, cutoff: int = None) -> CleanupResult:
         """Clean up expired board exports."""
         # Board exports would be tracked in FileUpload table with upload_type='export'
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         result = CleanupResult(job_type="exports")
         
         try:
-            current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+            if cutoff is None:
+                cutoff = int(time.time())
             
-            query = self.db.query(FileUpload).filter(
-                and_(
-                    FileUpload.upload_type == 'export',
-                    FileUpload.expires_at <= current_time
-                )
+            criteria = and_(
+                FileUpload.upload_type == 'export',
+                FileUpload.expires_at <= cutoff
             )
             
-            expired_exports = query.all()
-            deleted_count = len(expired_exports)
-            freed_bytes = sum(upload.file_size for upload in expired_exports)
+            # Count and size are aggregated in SQL rather than per hydrated row
+            deleted_count, freed_bytes = self.db.execute(
+                select(func.count(), func.coalesce(func.sum(FileUpload.file_size), 0)).where(criteria)
+            ).one()
             
             if deleted_count > 0:
-                query.delete()
+                self.db.query(FileUpload).filter(criteria).delete(synchronize_session=False)
                 self.db.commit()
             
             result.deleted_count = deleted_count
             result.freed_storage_bytes = freed_bytes
             result.success = True
-            result.execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            result.record_execution_time(start_time)
             
-            self.logger.info(f"Export cleanup completed: {deleted_count} exports deleted")
+            self._log_cleanup_completed(result)
             
         except Exception as e:
             self.db.rollback()
@@ -383,7 +506,8 @@ class DataExpirationService:
         
         return result
 
-    def _cleanup_expired_data(self, model_class, job_type: str, size_field: str = None) -> CleanupResult:
+    def _cleanup_expired_data(self, model_class, job_type: str, size_field: str = None,
+                              cutoff: int = None) -> CleanupResult:
         """
         Generic cleanup method for expired data.
         
@@ -391,24 +515,25 @@ class DataExpirationService:
             model_class: SQLAlchemy model class to clean
             job_type: Type of cleanup job for logging
             size_field: Field name containing size information
+            cutoff: Epoch seconds at or before which records are expired (now if None)
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         result = CleanupResult(job_type=job_type)
         
         try:
-            current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+            if cutoff is None:
+                cutoff = int(time.time())
             
-            query = self.db.query(model_class).filter(model_class.expires_at <= current_time)
-            expired_records = query.all()
-            deleted_count = len(expired_records)
+            criteria = model_class.expires_at <= cutoff
             
-            # Calculate freed space if size field provided
-            freed_bytes = 0
-            if size_field and deleted_count > 0:
-                freed_bytes = sum(getattr(record, size_field, 0) for record in expired_records)
+            # Calculate freed space in SQL if size field provided
+            size_total = func.coalesce(func.sum(getattr(model_class, size_field)), 0) if size_field else literal(0)
+            deleted_count, freed_bytes = self.db.execute(
+                select(func.count(), size_total).select_from(model_class).where(criteria)
+            ).one()
             
             if deleted_count > 0:
-                query.delete()
+                self.db.query(model_class).filter(criteria).delete(synchronize_session=False)
                 self.db.commit()
             
             result.deleted_count = deleted_count
@@ -417,9 +542,9 @@ class DataExpirationService:
             else:
                 result.freed_memory_bytes = freed_bytes
             result.success = True
-            result.execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            result.record_execution_time(start_time)
             
-            self.logger.info(f"{job_type} cleanup completed: {deleted_count} records deleted")
+            self._log_cleanup_completed(result)
             
         except Exception as e:
             self.db.rollback()
@@ -435,24 +560,41 @@ class DataExpirationService:
         Clean up all types of expired data.
         
         Args:
-            respect_grace_period: Whether to respect grace periods
+            respect_grace_period: Whether to keep expired data until its
+                policy's grace period has also passed
             
         Returns:
             Consolidated CleanupResult
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         overall_result = CleanupResult(job_type="all_data")
         
+        # Read the clock once; every operation gets a precomputed integer cutoff
+        now_epoch = int(time.time())
+        
+        def grace_cutoff(*data_types: str) -> int:
+            """Epoch cutoff for data types, shifted back by their longest grace period."""
+            if not respect_grace_period:
+                return now_epoch
+            grace_hours = max(self.get_policy(data_type).grace_period_hours for data_type in data_types)
+            return now_epoch - grace_hours * 3600
+        
         cleanup_operations = [
-            ("anonymous_strokes", lambda: self.cleanup_expired_strokes("anonymous")),
-            ("registered_strokes", lambda: self.cleanup_expired_strokes("registered")),
-            ("uploads", self.cleanup_expired_uploads),
-            ("templates", self.cleanup_expired_templates),
-            ("exports", self.cleanup_expired_exports),
-            ("user_presence", lambda: self._cleanup_expired_data(UserPresence, "user_presence")),
-            ("user_avatars", lambda: self._cleanup_expired_data(UserAvatar, "user_avatars", "file_size")),
-            ("login_history", lambda: self._cleanup_expired_data(LoginHistory, "login_history")),
-            ("edit_history", lambda: self._cleanup_expired_data(EditHistory, "edit_history"))
+            ("anonymous_strokes", lambda: self.cleanup_expired_strokes(
+                "anonymous", grace_cutoff("anonymous_strokes"))),
+            ("registered_strokes", lambda: self.cleanup_expired_strokes(
+                "registered", grace_cutoff("registered_strokes"))),
+            ("uploads", lambda: self.cleanup_expired_uploads(grace_cutoff("temporary_uploads"))),
+            ("templates", lambda: self.cleanup_expired_templates(grace_cutoff("unused_templates"))),
+            ("exports", lambda: self.cleanup_expired_exports(grace_cutoff("board_exports"))),
+            ("user_presence", lambda: self._cleanup_expired_data(
+                UserPresence, "user_presence", cutoff=grace_cutoff("user_presence"))),
+            ("user_avatars", lambda: self._cleanup_expired_data(
+                UserAvatar, "user_avatars", "file_size", grace_cutoff("user_avatars"))),
+            ("login_history", lambda: self._cleanup_expired_data(
+                LoginHistory, "login_history", cutoff=grace_cutoff("login_history"))),
+            ("edit_history", lambda: self._cleanup_expired_data(
+                EditHistory, "edit_history", cutoff=grace_cutoff("edit_history")))
         ]
         
         for operation_name, operation_func in cleanup_operations:
@@ -463,6 +605,7 @@ class DataExpirationService:
                 overall_result.freed_memory_bytes += result.freed_memory_bytes
                 overall_result.freed_storage_bytes += result.freed_storage_bytes
                 overall_result.error_count += result.error_count
+                overall_result.rollback_performed |= result.rollback_performed
                 
                 if result.success:
                     overall_result.log_entries.append(f"{operation_name}: {result.deleted_count} deleted")
@@ -475,13 +618,34 @@ class DataExpirationService:
                 self.logger.error(f"Cleanup operation {operation_name} failed: {e}")
         
         overall_result.success = overall_result.error_count == 0
-        overall_result.execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        overall_result.record_execution_time(start_time)
         
-        self.logger.info(f"Overall cleanup completed: {overall_result.deleted_count} records deleted, "
-                        f"{overall_result.error_count} errors")
+        self._log_cleanup_completed(overall_result)
         
         return overall_result
 
+    def _log_cleanup_completed(self, result: CleanupResult):
+        """
+        Log cleanup metrics as structured fields.
+        
+        The message is a fixed string and the metrics travel in ``extra``, so
+        log pipelines can parse them and nothing is built when INFO is disabled.
+        
+        Args:
+            result: Completed cleanup result to report
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        self.logger.info("cleanup completed", extra={
+            "job_type": result.job_type,
+            "deleted_count": result.deleted_count,
+            "freed_memory_bytes": result.freed_memory_bytes,
+            "freed_storage_bytes": result.freed_storage_bytes,
+            "error_count": result.error_count,
+            "execution_time_ms": result.execution_time_ms,
+        })
+
     async def cleanup_expired_data_async(self) -> CleanupResult:
         """
         Asynchronous version of cleanup_expired_data.
@@ -537,5 +701,15 @@ class DataExpirationService:
 
     def create_bulk_expired_data(self, record_count: int):
         """Create bulk expired data for performance testing."""
-        # This would be implemented for performance testing
-        pass
\ No newline at end of file
+        expired_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=25)
+        self.db.execute(insert(Stroke), [
+            {
+                "board_id": 1,
+                "user_id": None,
+                "stroke_data": b"expired_stroke_data",
+                "created_at": expired_time,
+                "expires_at": expired_time
+            }
+            for _ in range(record_count)
+        ])
+        self.db.commit()
\ No newline at end of file
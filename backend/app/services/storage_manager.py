@@ -28,13 +28,16 @@ import mimetypes
 from concurrent.futures import ThreadPoolExecutor
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, text
 
 from app.database import FileUpload, UserAvatar, BoardTemplate
 
 
 logger = logging.getLogger(__name__)
 
+# Filesystem paths are staged into a temp table in batches of this size
+ORPHAN_SCAN_BATCH_SIZE = 1000
+
 
 @dataclass
 class StorageUsageStats:
@@ -212,51 +215,28 @@ class StorageManager:
             return result
         
         try:
-            # Get all file references from database
-            db_file_paths = set()
-            
-            # FileUpload references
-            file_uploads = self.db.query(FileUpload).all()
-            for upload in file_uploads:
-                db_file_paths.add(upload.file_path)
-            
-            # UserAvatar references
-            avatars = self.db.query(UserAvatar).all()
-            for avatar in avatars:
-                db_file_paths.add(avatar.file_path)
-            
-            # Check filesystem for orphaned files
             orphaned_count = 0
             freed_bytes = 0
             
-            for storage_path in self.storage_paths.values():
-                if not storage_path.exists():
-                    continue
+            for file_path_str in self._find_orphaned_paths():
+                file_path = Path(file_path_str)
+                
+                try:
+                    file_size = file_path.stat().st_size
                     
-                for file_path in storage_path.rglob("*"):
-                    if not file_path.is_file():
-                        continue
+                    # Move to quarantine instead of immediate deletion for safety
+                    quarantine_path = self._quarantine_file(file_path)
                     
-                    try:
-                        file_path_str = str(file_path)
-                        
-                        # Check if file is referenced in database
-                        if file_path_str not in db_file_paths:
-                            file_size = file_path.stat().st_size
-                            
-                            # Move to quarantine instead of immediate deletion for safety
-                            quarantine_path = self._quarantine_file(file_path)
-                            
-                            orphaned_count += 1
-                            freed_bytes += file_size
-                            result.cleaned_paths.append(file_path_str)
-                            
-                            self.logger.debug(f"Quarantined orphaned file: {file_path} -> {quarantine_path}")
+                    orphaned_count += 1
+                    freed_bytes += file_size
+                    result.cleaned_paths.append(file_path_str)
                     
-                    except Exception as e:
-                        result.error_count += 1
-                        result.errors.append(f"Failed to process orphaned file {file_path}: {str(e)}")
-                        self.logger.error(f"Failed to process orphaned file {file_path}: {e}")
+                    self.logger.debug(f"Quarantined orphaned file: {file_path} -> {quarantine_path}")
+                
+                except Exception as e:
+                    result.error_count += 1
+                    result.errors.append(f"Failed to process orphaned file {file_path}: {str(e)}")
+                    self.logger.error(f"Failed to process orphaned file {file_path}: {e}")
             
             result.orphaned_files_count = orphaned_count
             result.freed_bytes = freed_bytes
@@ -273,6 +253,50 @@ class StorageManager:
         result.execution_time_seconds = (datetime.now() - start_time).total_seconds()
         return result
 
+    def _iter_storage_files(self):
+        """Yield every file under the managed storage directories."""
+        for storage_path in self.storage_paths.values():
+            if not storage_path.exists():
+                continue
+            
+            for file_path in storage_path.rglob("*"):
+                if file_path.is_file():
+                    yield file_path
+
+    def _find_orphaned_paths(self) -> List[str]:
+        """
+        Find files on disk that are not referenced in the database.
+        
+        Filesystem paths are streamed into a temporary table and anti-joined
+        against file_uploads and user_avatars inside the database, so the
+        referenced paths are never loaded into Python memory.
+        
+        Returns:
+            Paths of orphaned files
+        """
+        conn = self.db.connection()
+        conn.execute(text("CREATE TEMP TABLE IF NOT EXISTS fs_paths (path TEXT PRIMARY KEY)"))
+        insert_path = text("INSERT INTO fs_paths (path) VALUES (:path)")
+        
+        try:
+            batch = []
+            for file_path in self._iter_storage_files():
+                batch.append({"path": str(file_path)})
+                if len(batch) >= ORPHAN_SCAN_BATCH_SIZE:
+                    conn.execute(insert_path, batch)
+                    batch = []
+            if batch:
+                conn.execute(insert_path, batch)
+            
+            conn.execute(text("""
+                DELETE FROM fs_paths
+                WHERE EXISTS (SELECT 1 FROM file_uploads WHERE file_uploads.file_path = fs_paths.path)
+                   OR EXISTS (SELECT 1 FROM user_avatars WHERE user_avatars.file_path = fs_paths.path)
+            """))
+            return conn.execute(text("SELECT path FROM fs_paths")).scalars().all()
+        finally:
+            conn.execute(text("DROP TABLE IF EXISTS fs_paths"))
+
     def _quarantine_file(self, file_path: Path) -> Path:
         """
         Move file to quarantine directory instead of deleting immediately.
@@ -363,35 +387,16 @@ class StorageManager:
             return {"size": 0, "count": 0}
         
         try:
-            # Get all file references from database
-            db_file_paths = set()
-            
-            file_uploads = self.db.query(FileUpload).all()
-            for upload in file_uploads:
-                db_file_paths.add(upload.file_path)
-            
-            avatars = self.db.query(UserAvatar).all()
-            for avatar in avatars:
-                db_file_paths.add(avatar.file_path)
-            
             # Count orphaned files
             orphaned_size = 0
             orphaned_count = 0
             
-            for storage_path in self.storage_paths.values():
-                if not storage_path.exists():
-                    continue
-                    
-                for file_path in storage_path.rglob("*"):
-                    if file_path.is_file():
-                        file_path_str = str(file_path)
-                        
-                        if file_path_str not in db_file_paths:
-                            try:
-                                orphaned_size += file_path.stat().st_size
-                                orphaned_count += 1
-                            except OSError:
-                                pass
+            for file_path_str in self._find_orphaned_paths():
+                try:
+                    orphaned_size += Path(file_path_str).stat().st_size
+                    orphaned_count += 1
+                except OSError:
+                    pass
             
             return {"size": orphaned_size, "count": orphaned_count}
             
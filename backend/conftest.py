@@ -3,16 +3,35 @@ Pytest configuration for collaborative drawing board tests.
 Sets up test database and fixtures.
 """
 
+import os
+
 import pytest
+from sqlalchemy.engine import make_url
+
+# Under pytest-xdist every worker gets its own database (SQLite file or
+# PostgreSQL schema) so test modules can run in parallel without sharing
+# tables. This must happen before app.database builds its engine.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if XDIST_WORKER:
+    _database_url = make_url(os.environ.get("DATABASE_URL", "sqlite:///./test_db.sqlite"))
+    if _database_url.get_backend_name() == "sqlite":
+        # In-memory databases are already private to each worker process
+        if _database_url.database and _database_url.database != ":memory:":
+            _root, _ext = os.path.splitext(_database_url.database)
+            _database_url = _database_url.set(database=f"{_root}_{XDIST_WORKER}{_ext}")
+    else:
+        _database_url = _database_url.update_query_dict({"options": f"-csearch_path=test_{XDIST_WORKER}"})
+    os.environ["DATABASE_URL"] = _database_url.render_as_string(hide_password=False)
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, engine as app_engine
 
 # Create test database engine
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///./test_{XDIST_WORKER}.db" if XDIST_WORKER else "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -25,6 +44,14 @@ def override_get_db():
     finally:
         db.close()
 
+@pytest.fixture(scope="session", autouse=True)
+def xdist_worker_schema():
+    """Create this xdist worker's PostgreSQL schema before any tables are built in it."""
+    if XDIST_WORKER and app_engine.dialect.name == "postgresql":
+        with app_engine.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "test_{XDIST_WORKER}"'))
+
+
 @pytest.fixture(scope="function")
 def test_db():
     """Create test database tables before each test."""
@@ -14,31 +14,61 @@ Test Coverage:
 - Performance metrics tracking
 """
 
+import asyncio
+import time
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, patch, AsyncMock
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.compiler import SQLCompiler
 
-from app.database import get_db, engine
+from app.database import Base, get_db
 from app.database import (
     User, Board, Stroke, FileUpload, BoardTemplate, DataCleanupJob, 
     UserAvatar, UserPresence, LoginHistory, EditHistory
 )
-from app.services.data_expiration import DataExpirationService, TTLPolicy
-from app.services.cleanup_scheduler import CleanupScheduler
-from app.services.storage_manager import StorageManager
+from app.services.data_expiration import DataExpirationService, TTLPolicy, CleanupResult
+from app.services.cleanup_scheduler import CleanupScheduler, SchedulerConfig
+from app.services.storage_manager import StorageManager, CleanupOperationResult
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Create an in-memory SQLite engine with the schema built once per test session."""
+    test_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so per-test SAVEPOINTs roll back cleanly
+    @event.listens_for(test_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(test_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(test_engine)
+    yield test_engine
+    test_engine.dispose()
 
 
 @pytest.fixture
-def db_session():
-    """Create a test database session."""
-    from app.database import SessionLocal
-    db = SessionLocal()
+def db_session(engine):
+    """Create a test database session whose changes are rolled back after each test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture
@@ -72,6 +102,62 @@ class TestTTLDatabaseSchema:
         columns = [row[1] for row in result.fetchall()]
         assert "expires_at" in columns
 
+    def test_sqlite_connection_pragmas(self):
+        """Test that application connections use WAL with synchronous=NORMAL."""
+        from app.database import engine as app_engine
+
+        with app_engine.connect() as conn:
+            # WAL + synchronous=NORMAL avoids an fsync per batched cleanup commit
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+
+    def test_expires_at_is_integer_epoch(self, db_session):
+        """Test that strokes.expires_at is stored as BIGINT epoch seconds and range-scanned via its index."""
+        result = db_session.execute(text("PRAGMA table_info(strokes)"))
+        column_types = {row[1]: row[2] for row in result.fetchall()}
+        assert column_types["expires_at"] == "BIGINT"
+
+        cutoff_epoch = int(time.time())
+        plan = db_session.execute(
+            text("EXPLAIN QUERY PLAN DELETE FROM strokes WHERE expires_at < :c"),
+            {"c": cutoff_epoch}
+        ).fetchall()
+        plan_details = " ".join(row[-1] for row in plan)
+        assert "USING INDEX" in plan_details
+        assert "expires_at<?" in plan_details
+
+    def test_legacy_datetime_expiry_values_are_migrated(self):
+        """Test that DATETIME expiry values from older databases are converted to epoch seconds."""
+        from app.database import EpochSeconds, migrate_expires_at_to_epoch_seconds
+
+        legacy_engine = create_engine("sqlite://", poolclass=StaticPool)
+        try:
+            with legacy_engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE TABLE strokes (id INTEGER PRIMARY KEY, expires_at DATETIME NOT NULL)"
+                ))
+                conn.execute(text(
+                    "INSERT INTO strokes (expires_at) VALUES "
+                    "('2024-01-01 00:00:00.000000'), ('2024-01-01 00:00:00.900000'), (1704067300)"
+                ))
+
+            # Run twice: already-converted rows must be left untouched
+            migrate_expires_at_to_epoch_seconds(legacy_engine)
+            migrate_expires_at_to_epoch_seconds(legacy_engine)
+
+            with legacy_engine.connect() as conn:
+                rows = conn.execute(text(
+                    "SELECT expires_at, typeof(expires_at) FROM strokes ORDER BY id"
+                )).fetchall()
+        finally:
+            legacy_engine.dispose()
+
+        # Fractional seconds are floored, as EpochSeconds does for new rows
+        assert [tuple(row) for row in rows] == [
+            (1704067200, "integer"), (1704067200, "integer"), (1704067300, "integer")
+        ]
+        assert EpochSeconds().process_bind_param(datetime(2024, 1, 1, 0, 0, 0, 900000), None) == 1704067200
+
     def test_file_uploads_table_has_expires_at_column(self, db_session):
         """Test that file_uploads table has expires_at TIMESTAMP column."""
         # This will fail - file_uploads table doesn't exist yet
@@ -186,18 +272,71 @@ class TestDataExpirationService:
         assert anonymous_policy.ttl_hours == 24
         assert anonymous_policy.grace_period_hours == 1
 
-    def test_anonymous_user_strokes_cleanup(self, db_session):
+    def test_ttl_policy_is_singleton(self):
+        """Test that policy lookups return shared instances instead of rebuilding them."""
+        service = DataExpirationService()
+
+        result1 = service.get_policy("anonymous_strokes")
+        result2 = service.get_policy("anonymous_strokes")
+        assert result1 is result2
+        assert DataExpirationService().get_policy("anonymous_strokes") is result1
+
+        with pytest.raises(TypeError):
+            service.ttl_policies["anonymous_strokes"] = result1
+
+    def test_anonymous_user_strokes_cleanup(self, db_session, engine):
         """Test cleanup of anonymous user strokes after 24 hours."""
         # This will fail - DataExpirationService doesn't exist yet
         service = DataExpirationService(db_session)
         
         # Create expired anonymous stroke data
         expired_time = datetime.now(timezone.utc) - timedelta(hours=25)
+        db_session.add_all([
+            Stroke(board_id=1, user_id=None, stroke_data=b'anonymous_%d' % i, expires_at=expired_time)
+            for i in range(3)
+        ])
+        # Expired registered strokes are left for the registered pass
+        db_session.add(Stroke(board_id=1, user_id=1, stroke_data=b'registered', expires_at=expired_time))
+        db_session.commit()
         
+        statements = []
+
+        def capture_sql(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lower())
+
         # This would require strokes table to exist
-        cleanup_result = service.cleanup_expired_strokes(user_type="anonymous")
-        assert cleanup_result.deleted_count > 0
-        assert cleanup_result.freed_memory_bytes > 0
+        event.listen(engine, "before_cursor_execute", capture_sql)
+        try:
+            cleanup_result = service.cleanup_expired_strokes(user_type="anonymous")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture_sql)
+
+        # Freed bytes come from one SQL aggregate, never from hydrated stroke rows
+        assert sum("sum(length(" in sql for sql in statements) == 1
+        selects = [sql for sql in statements if sql.lstrip().startswith("select")]
+        assert not any("strokes.stroke_data" in sql and "length(" not in sql for sql in selects)
+
+        assert cleanup_result.deleted_count == 3
+        assert cleanup_result.freed_memory_bytes == 3 * len(b'anonymous_0')
+        assert db_session.query(Stroke).count() == 1
+
+    def test_stroke_cleanup_reuses_compiled_statements(self, db_session):
+        """Test that repeated stroke cleanups reuse compiled statements instead of recompiling."""
+        service = DataExpirationService(db_session)
+        original_init = SQLCompiler.__init__
+
+        with patch.object(SQLCompiler, '__init__', autospec=True, side_effect=original_init) as compiler_init:
+            for _ in range(100):
+                service.cleanup_expired_strokes(user_type="anonymous")
+
+        # At most one compile per statement shape, not one per call; SAVEPOINT
+        # bookkeeping from the rolled-back test transaction is not counted
+        savepoint_clauses = {"savepoint", "release_savepoint", "rollback_to_savepoint"}
+        statement_compiles = [
+            call for call in compiler_init.call_args_list
+            if call.args[2].__visit_name__ not in savepoint_clauses
+        ]
+        assert len(statement_compiles) <= 5
 
     def test_registered_user_strokes_cleanup(self, db_session, sample_user):
         """Test cleanup of registered user strokes after 30 days."""
@@ -256,6 +395,53 @@ class TestDataExpirationService:
         # Should not delete data still in grace period
         assert cleanup_result.skipped_count > 0
 
+    def test_grace_cutoff_computed_once(self, db_session):
+        """Test that grace-period cutoffs are precomputed from a single clock read per cleanup run."""
+        service = DataExpirationService(db_session)
+
+        with patch("app.services.data_expiration.time", wraps=time) as mock_time:
+            cleanup_result = service.cleanup_expired_data(respect_grace_period=True)
+
+        assert cleanup_result.success
+        assert mock_time.time.call_count == 1
+
+    def test_grace_period_delays_stroke_deletion(self, db_session):
+        """Test that strokes expired within their policy's grace period survive a grace-respecting cleanup."""
+        service = DataExpirationService(db_session)
+        assert service.get_policy("anonymous_strokes").grace_period_hours == 1
+
+        # Expired 30 minutes ago: past its TTL but still inside the 1 hour grace period
+        expired_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=30)
+        db_session.add(Stroke(board_id=1, user_id=None, stroke_data=b'in_grace', expires_at=expired_time))
+        db_session.commit()
+
+        assert service.cleanup_expired_data(respect_grace_period=True).deleted_count == 0
+        assert db_session.query(Stroke).count() == 1
+
+        assert service.cleanup_expired_data(respect_grace_period=False).deleted_count == 1
+        assert db_session.query(Stroke).count() == 0
+
+    def test_default_cleanup_keeps_rows_inside_each_policy_grace_period(self, db_session):
+        """Test that the default cleanup applies each data type's own grace period to its cutoff."""
+        service = DataExpirationService(db_session)
+        assert service.get_policy("login_history").grace_period_hours == 24
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        db_session.add_all([
+            # Inside login history's 24 hour grace period, though past the strokes' 1 hour one
+            LoginHistory(user_id=1, ip_address='10.0.0.1', expires_at=now - timedelta(hours=12)),
+            LoginHistory(user_id=1, ip_address='10.0.0.2', expires_at=now - timedelta(hours=25)),
+            Stroke(board_id=1, user_id=None, stroke_data=b'past_grace', expires_at=now - timedelta(hours=12)),
+        ])
+        db_session.commit()
+
+        cleanup_result = service.cleanup_expired_data()
+
+        assert cleanup_result.success
+        assert cleanup_result.deleted_count == 2
+        assert [row.ip_address for row in db_session.query(LoginHistory).all()] == ['10.0.0.1']
+        assert db_session.query(Stroke).count() == 0
+
     @pytest.mark.asyncio
     async def test_cleanup_metrics_tracking(self, db_session):
         """Test that cleanup operations track performance metrics."""
@@ -291,6 +477,40 @@ class TestCleanupScheduler:
         job_id = scheduler.schedule_cleanup_job(interval_hours=6)
         assert job_id is not None
         assert scheduler.is_job_scheduled(job_id)
+        
+        # Overlapping runs are skipped and missed runs are coalesced
+        job = scheduler.scheduler.get_job(job_id)
+        assert job.coalesce is True
+        assert job.max_instances == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_coalescing(self):
+        """Test that triggers missed while the scheduler was paused are submitted as a single run."""
+        from apscheduler.events import EVENT_JOB_SUBMITTED
+
+        scheduler = CleanupScheduler(SchedulerConfig(resource_check_enabled=False, enable_notifications=False))
+        job_id = scheduler.schedule_cleanup_job(interval_hours=1)
+        submitted = asyncio.Event()
+        submitted_run_times = []
+
+        def record_submission(event):
+            submitted_run_times.append(event.scheduled_run_times)
+            submitted.set()
+
+        scheduler.scheduler.add_listener(record_submission, EVENT_JOB_SUBMITTED)
+        await scheduler.start()
+        try:
+            # Rewind the job so four hourly triggers fall due while paused
+            scheduler.scheduler.pause()
+            scheduler.scheduler.get_job(job_id).modify(
+                next_run_time=datetime.now(timezone.utc) - timedelta(hours=3, minutes=30)
+            )
+            scheduler.scheduler.resume()
+            await asyncio.wait_for(submitted.wait(), timeout=5)
+        finally:
+            await scheduler.stop()
+
+        assert [len(run_times) for run_times in submitted_run_times] == [1]
 
     @pytest.mark.asyncio
     async def test_automated_cleanup_execution(self):
@@ -377,6 +597,46 @@ class TestStorageManager:
         assert hasattr(cleanup_result, 'orphaned_files_count')
         assert hasattr(cleanup_result, 'freed_bytes')
 
+    def test_orphaned_files_cleanup_memory_bounded(self, db_session, tmp_path):
+        """Orphan detection must not load every referenced path into Python memory."""
+        import tracemalloc
+        from sqlalchemy import insert
+
+        storage = StorageManager(base_path=str(tmp_path), db_session=db_session)
+        uploads_dir = tmp_path / "uploads"
+        uploads_dir.mkdir(parents=True, exist_ok=True)
+
+        # 100k referenced rows, only the first few of which exist on disk
+        expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+        db_session.execute(insert(FileUpload), [
+            {
+                "filename": f"file_{i}.bin",
+                "file_path": str(uploads_dir / f"file_{i}.bin"),
+                "file_size": 16,
+                "mime_type": "application/octet-stream",
+                "upload_type": "temporary",
+                "expires_at": expires_at,
+            }
+            for i in range(100_000)
+        ])
+        db_session.commit()
+
+        for i in range(5):
+            (uploads_dir / f"file_{i}.bin").write_bytes(b"x" * 16)
+        for i in range(3):
+            (uploads_dir / f"orphan_{i}.bin").write_bytes(b"y" * 32)
+
+        tracemalloc.start()
+        try:
+            cleanup_result = storage.cleanup_orphaned_files()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert cleanup_result.orphaned_files_count == 3
+        assert cleanup_result.freed_bytes == 96
+        assert peak_bytes < 10 * 1024 * 1024
+
 
 class TestTTLPolicyEnforcement:
     """Test TTL policy enforcement and user notifications."""
@@ -440,39 +700,83 @@ class TestCleanupIntegration:
     """Integration tests for complete TTL cleanup lifecycle."""
 
     @pytest.mark.asyncio
-    async def test_complete_cleanup_cycle(self, db_session):
-        """Test complete data cleanup cycle from creation to deletion."""
-        # This will fail - complete integration doesn't exist yet
-        service = DataExpirationService(db_session)
-        scheduler = CleanupScheduler()
-        storage = StorageManager()
-        
-        # Create test data with various expiry times
-        await service.create_test_data_with_ttl()
-        
-        # Execute full cleanup cycle
-        cleanup_result = await scheduler.execute_full_cleanup()
-        
-        assert cleanup_result.database_cleanup_success
-        assert cleanup_result.filesystem_cleanup_success
-        assert cleanup_result.total_freed_bytes > 0
-
-    def test_cleanup_performance_under_load(self, db_session):
+    async def test_complete_cleanup_cycle(self, tmp_path):
+        """Test complete data cleanup cycle runs database and filesystem cleanup concurrently."""
+        scheduler = CleanupScheduler(storage_manager=StorageManager(base_path=str(tmp_path)))
+        
+        async def slow_db_cleanup():
+            await asyncio.sleep(0.5)
+            return CleanupResult(job_type="all_data", success=True, deleted_count=3, freed_memory_bytes=1024)
+        
+        async def slow_fs_cleanup(*args, **kwargs):
+            await asyncio.sleep(0.5)
+            return CleanupOperationResult(operation_type="expired_cleanup_all", success=True,
+                                          deleted_files_count=2, freed_bytes=2048)
+        
+        with patch.object(DataExpirationService, 'cleanup_expired_data_async',
+                          AsyncMock(side_effect=slow_db_cleanup)), \
+             patch.object(StorageManager, 'cleanup_expired_files_async',
+                          AsyncMock(side_effect=slow_fs_cleanup)):
+            start = time.perf_counter()
+            cleanup_result = await scheduler.execute_full_cleanup()
+            elapsed = time.perf_counter() - start
+        
+        # Both 0.5s cleanups must overlap rather than run back to back
+        assert elapsed < 0.8
+        assert cleanup_result["database_cleanup_success"]
+        assert cleanup_result["filesystem_cleanup_success"]
+        assert cleanup_result["total_freed_bytes"] == 3072
+
+    def test_cleanup_performance_under_load(self, db_session, engine):
         """Test cleanup performance with large amounts of expired data."""
-        # This will fail - performance testing doesn't exist yet
         service = DataExpirationService(db_session)
         
         # Create large amount of expired test data
         service.create_bulk_expired_data(record_count=10000)
         
-        # Measure cleanup performance
-        start_time = datetime.now()
-        cleanup_result = service.cleanup_expired_data()
-        execution_time = datetime.now() - start_time
+        delete_rowcounts = []
+        delete_statements = []
+        commits = []
+
+        def capture_deletes(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("DELETE"):
+                delete_statements.append(statement)
+                delete_rowcounts.append(cursor.rowcount)
+
+        def count_commit(session):
+            commits.append(session)
+
+        event.listen(engine, "after_cursor_execute", capture_deletes)
+        event.listen(db_session, "after_commit", count_commit)
+        try:
+            # Measure cleanup performance
+            t0 = time.perf_counter_ns()
+            cleanup_result = service.cleanup_expired_data()
+            execution_time_ns = time.perf_counter_ns() - t0
+        finally:
+            event.remove(engine, "after_cursor_execute", capture_deletes)
+            event.remove(db_session, "after_commit", count_commit)
         
         # Cleanup should complete within reasonable time
-        assert execution_time.total_seconds() < 30  # Less than 30 seconds
+        assert execution_time_ns < 30 * 1_000_000_000  # Less than 30 seconds
         assert cleanup_result.deleted_count == 10000
+        
+        # Deletes are bounded batches, each committed separately
+        assert all("LIMIT" in statement for statement in delete_statements)
+        assert all(rowcount <= 1000 for rowcount in delete_rowcounts)
+        assert len(commits) >= 10
+
+    def test_execution_time_uses_perf_counter(self, db_session):
+        """Test that execution time is measured with nanosecond perf_counter resolution."""
+        service = DataExpirationService(db_session)
+
+        results = [service.cleanup_expired_data() for _ in range(5)]
+
+        # Millisecond-rounded clocks would leave whole-millisecond nanosecond counts
+        sub_millisecond = sum(result.execution_time_ns % 1_000_000 != 0 for result in results)
+        assert sub_millisecond > len(results) // 2
+        for result in results:
+            assert result.execution_time_ms == result.execution_time_ns // 1_000_000
 
     def test_cleanup_atomic_operations(self, db_session):
         """Test that cleanup operations are atomic (all succeed or all fail)."""
@@ -489,18 +793,140 @@ class TestCleanupIntegration:
             assert cleanup_result.success is False
             assert cleanup_result.rollback_performed is True
 
+    def test_stroke_cleanup_deletes_in_id_batches(self, db_session, engine):
+        """Test that expired strokes are deleted by explicit ID batches, not cascading triggers."""
+        service = DataExpirationService(db_session)
+        expired_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=25)
+        db_session.add_all([
+            Stroke(board_id=1, user_id=None, stroke_data=b'expired', expires_at=expired_time)
+            for _ in range(5)
+        ])
+        db_session.commit()
+
+        statements = []
+
+        def capture_sql(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture_sql)
+        try:
+            deleted_count = service.delete_expired_strokes(
+                datetime.now(timezone.utc).replace(tzinfo=None), user_type="anonymous", batch_size=2
+            )
+            db_session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture_sql)
+
+        stroke_deletes = [s for s in statements if s.lstrip().upper().startswith("DELETE FROM STROKES")]
+        assert deleted_count == 5
+        assert len(stroke_deletes) == 3  # batches of 2, 2 and 1
+        assert all("strokes.id IN" in s for s in stroke_deletes)
+
+        # No triggers do hidden per-row work behind the batch deletes
+        triggers = db_session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type='trigger' AND tbl_name='strokes'"
+        )).fetchall()
+        assert triggers == []
+
+    def test_stroke_cleanup_records_job_once(self, db_session, engine):
+        """Test that the job row is written once after the batches and unknown user types clean all strokes."""
+        service = DataExpirationService(db_session, delete_batch_size=2)
+        expired_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=25)
+        db_session.add_all([
+            Stroke(board_id=1, user_id=user_id, stroke_data=b'expired', expires_at=expired_time)
+            for user_id in (None, None, 1, 1)
+        ])
+        db_session.commit()
+
+        statements = []
+        commits = []
+
+        def capture_sql(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lstrip().upper())
+
+        def count_commit(session):
+            commits.append(session)
+
+        event.listen(engine, "before_cursor_execute", capture_sql)
+        event.listen(db_session, "after_commit", count_commit)
+        try:
+            cleanup_result = service.cleanup_expired_strokes(user_type="unknown")
+        finally:
+            event.remove(engine, "before_cursor_execute", capture_sql)
+            event.remove(db_session, "after_commit", count_commit)
+
+        assert cleanup_result.success
+        assert cleanup_result.deleted_count == 4
+
+        # Two full batches, an empty final batch, then the job row in its own commit
+        job_inserts = [i for i, s in enumerate(statements) if s.startswith("INSERT INTO DATA_CLEANUP_JOBS")]
+        stroke_deletes = [i for i, s in enumerate(statements) if s.startswith("DELETE FROM STROKES")]
+        assert len(job_inserts) == 1
+        assert job_inserts[0] > stroke_deletes[-1]
+        assert len(commits) == 3
+        assert not any("FROM DATA_CLEANUP_JOBS" in s for s in statements)
+
+        job = db_session.query(DataCleanupJob).one()
+        assert job.status == 'completed'
+        assert job.deleted_count == 4
+
+    def test_stroke_batches_skip_locked_rows_on_postgresql(self, db_session):
+        """Test that batch deletes claim rows with SKIP LOCKED on PostgreSQL and honor the service batch size."""
+        from sqlalchemy.dialects import postgresql
+        from app.services.data_expiration import DELETE_EXPIRED_STROKE_BATCH
+
+        compiled = str(DELETE_EXPIRED_STROKE_BATCH["all"].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in compiled
+
+        service = DataExpirationService(db_session, delete_batch_size=2)
+        expired_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=25)
+        db_session.add_all([
+            Stroke(board_id=1, user_id=None, stroke_data=b'expired', expires_at=expired_time)
+            for _ in range(3)
+        ])
+        db_session.commit()
+
+        assert service.delete_expired_strokes(int(time.time())) == 3
+
+    def test_stroke_batches_can_be_scoped_to_one_board(self, db_session):
+        """Test that a board-scoped delete leaves other boards' expired strokes in place."""
+        service = DataExpirationService(db_session, delete_batch_size=2)
+        expired_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=25)
+        db_session.add_all([
+            Stroke(board_id=board_id, user_id=None, stroke_data=b'expired', expires_at=expired_time)
+            for board_id in (1, 1, 1, 2)
+        ])
+        db_session.commit()
+
+        assert service.delete_expired_strokes(int(time.time()), board_id=1) == 3
+        assert db_session.query(Stroke).filter(Stroke.board_id == 2).count() == 1
+
     def test_cleanup_logging_and_monitoring(self, db_session):
         """Test cleanup operations generate proper logs and monitoring data."""
         # This will fail - logging system doesn't exist yet
         service = DataExpirationService(db_session)
         
-        with patch('app.services.data_expiration.logger') as mock_logger:
+        with patch.object(service, 'logger') as mock_logger:
+            mock_logger.isEnabledFor.return_value = True
             cleanup_result = service.cleanup_expired_data()
             
-            # Should log cleanup operations
+            # Should log cleanup operations with a literal message template
             mock_logger.info.assert_called()
-            assert any("cleanup completed" in str(call) for call in mock_logger.info.call_args_list)
+            for call in mock_logger.info.call_args_list:
+                assert call.args == ("cleanup completed",)
+            
+            # Metrics travel as structured fields, not formatted into the message
+            overall_extra = mock_logger.info.call_args_list[-1].kwargs["extra"]
+            assert overall_extra["job_type"] == "all_data"
+            assert overall_extra["deleted_count"] == cleanup_result.deleted_count
+            assert "execution_time_ms" in overall_extra
             
             # Should include metrics in logs
             assert hasattr(cleanup_result, 'log_entries')
-            assert len(cleanup_result.log_entries) > 0
\ No newline at end of file
+            assert len(cleanup_result.log_entries) > 0
+
+        # Disabled INFO level skips building the structured payload entirely
+        with patch.object(service, 'logger') as mock_logger:
+            mock_logger.isEnabledFor.return_value = False
+            service.cleanup_expired_data()
+            mock_logger.info.assert_not_called()
\ No newline at end of file
@@ -5,6 +5,7 @@ These tests ensure drawing data is properly encrypted using AES-GCM.
 
 import pytest
 import json
+import orjson
 from cryptography.exceptions import InvalidTag
 from app.security import DrawingEncryption
 
@@ -12,10 +13,15 @@ from app.security import DrawingEncryption
 class TestDrawingEncryption:
     """Test cases for drawing data encryption."""
     
-    def test_encrypt_decrypt_drawing_data(self):
+    @pytest.fixture(scope="class")
+    def encryption(self):
+        """Share one key and AES-GCM context across tests that don't need a distinct key."""
+        return DrawingEncryption()
+    
+    def test_encrypt_decrypt_drawing_data(self, encryption):
         """Test basic encryption and decryption of drawing data."""
         # Sample drawing data
-        drawing_data = json.dumps({
+        drawing_data = orjson.dumps({
             "shapes": [
                 {"type": "line", "points": [10, 20, 30, 40], "stroke": "black"},
                 {"type": "circle", "x": 100, "y": 150, "radius": 50, "fill": "red"}
@@ -23,8 +29,6 @@ class TestDrawingEncryption:
             "timestamp": "2024-01-01T12:00:00Z"
         })
         
-        encryption = DrawingEncryption()
-        
         # Encrypt the data
         encrypted_data, nonce = encryption.encrypt_drawing_data(drawing_data)
         
@@ -37,13 +41,12 @@ class TestDrawingEncryption:
         decrypted_data = encryption.decrypt_drawing_data(encrypted_data, nonce)
         
         # Verify decrypted data matches original
-        assert decrypted_data == drawing_data
-        assert json.loads(decrypted_data) == json.loads(drawing_data)
+        assert decrypted_data == drawing_data.decode('utf-8')
+        assert orjson.loads(decrypted_data) == orjson.loads(drawing_data)
     
-    def test_encryption_produces_different_ciphertext(self):
+    def test_encryption_produces_different_ciphertext(self, encryption):
         """Test that same data produces different ciphertext due to random nonce."""
         drawing_data = '{"test": "data"}'
-        encryption = DrawingEncryption()
         
         encrypted1, nonce1 = encryption.encrypt_drawing_data(drawing_data)
         encrypted2, nonce2 = encryption.encrypt_drawing_data(drawing_data)
@@ -72,10 +75,9 @@ class TestDrawingEncryption:
         
         assert decrypted_data == drawing_data
     
-    def test_invalid_tag_on_tampering(self):
+    def test_invalid_tag_on_tampering(self, encryption):
         """Test that tampered ciphertext raises InvalidTag."""
         drawing_data = '{"secret": "drawing data"}'
-        encryption = DrawingEncryption()
         
         encrypted_data, nonce = encryption.encrypt_drawing_data(drawing_data)
         
@@ -101,11 +103,10 @@ class TestDrawingEncryption:
     
     # FAILING TESTS for TDD - implement these features
     
-    def test_encrypt_user_session_data(self):
+    def test_encrypt_user_session_data(self, encryption):
         """Test encryption of user session data - SHOULD FAIL initially."""
         user_data = {"user_id": "123", "session_key": "secret_key", "permissions": ["read", "write"]}
         
-        encryption = DrawingEncryption()
         encrypted_session = encryption.encrypt_user_session(json.dumps(user_data))
         
         assert "user_id" not in encrypted_session
@@ -114,7 +115,7 @@ class TestDrawingEncryption:
         decrypted_session = encryption.decrypt_user_session(encrypted_session)
         assert json.loads(decrypted_session) == user_data
     
-    def test_batch_encrypt_drawing_operations(self):
+    def test_batch_encrypt_drawing_operations(self, encryption):
         """Test batch encryption of drawing operations - SHOULD FAIL initially."""
         operations = [
             {"op": "draw_line", "data": [1, 2, 3, 4]},
@@ -122,7 +123,6 @@ class TestDrawingEncryption:
             {"op": "erase", "data": {"area": [5, 5, 15, 15]}}
         ]
         
-        encryption = DrawingEncryption()
         encrypted_batch = encryption.encrypt_operations_batch(operations)
         
         assert len(encrypted_batch) == len(operations)
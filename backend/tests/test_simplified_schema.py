@@ -14,56 +14,172 @@ HONEST COMPARISON:
 - Better real-world usability
 """
 
+import contextlib
+import logging
+
 import pytest
 from datetime import datetime, timezone, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import create_engine, delete, event, func, insert, select, text
+from sqlalchemy.pool import StaticPool
 
 from app.database_simplified import (
-    SessionLocal, create_tables, engine, get_simplified_schema_info,
+    Base, get_simplified_schema_info,
     User, Board, Stroke, FileUpload, ActivityLog, DataCleanupJob
 )
 
 
-@pytest.fixture
-def simplified_db():
-    """Provide a clean simplified database for testing."""
-    create_tables()
-    
-    db = SessionLocal()
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def count_queries(conn):
+    """Collect every SQL statement sent to the database on ``conn``."""
+    queries = []
+
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(conn, "before_cursor_execute", record_query)
     try:
-        # Clean all test data
-        db.query(Stroke).delete()
-        db.query(FileUpload).delete()
-        db.query(ActivityLog).delete()  
-        db.query(DataCleanupJob).delete()
-        db.query(Board).delete()
-        db.query(User).delete()
+        yield queries
+    finally:
+        event.remove(conn, "before_cursor_execute", record_query)
+
+
+def user_graph_query(user_id):
+    """Select a user joined with their activities and files; any other lazy load raises."""
+    return select(User).where(User.id == user_id).options(
+        joinedload(User.activities),
+        joinedload(User.files),
+        raiseload("*")
+    )
+
+
+def sweep_expired(session, model, now):
+    """Delete ``model`` rows expired at ``now`` in one statement and return their ids."""
+    return session.execute(
+        delete(model)
+        .where(model.expires_at <= now)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+
+def add_file_uploads(session, user_id, board_id, now):
+    """Add one template, one board export and one temporary upload; return them keyed by upload_type."""
+    uploads = {
+        "template": FileUpload(
+            user_id=user_id,
+            filename="template.json",
+            file_path="/uploads/templates/template.json",
+            file_size=1024,
+            mime_type="application/json",
+            upload_type="template",
+            usage_count=5,
+            last_used_at=now,
+            expires_at=now + timedelta(days=7)
+        ),
+        "export": FileUpload(
+            user_id=user_id,
+            board_id=board_id,
+            filename="board_export.png",
+            file_path="/uploads/exports/export.png",
+            file_size=2048,
+            mime_type="image/png",
+            upload_type="export",
+            expires_at=now + timedelta(hours=48)
+        ),
+        "temporary": FileUpload(
+            user_id=user_id,
+            filename="temp_file.tmp",
+            file_path="/uploads/temp/temp.tmp",
+            file_size=512,
+            mime_type="application/octet-stream",
+            upload_type="temporary",
+            expires_at=now + timedelta(hours=1)
+        ),
+    }
+    session.add_all(uploads.values())
+    return uploads
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Create an in-memory SQLite engine with the simplified schema built once per test session."""
+    # A private (unnamed) in-memory database lives only in this process, so
+    # every pytest-xdist worker gets its own copy without per-worker naming
+    test_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so per-test SAVEPOINTs roll back cleanly
+    @event.listens_for(test_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(test_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def connection(engine):
+    """Hold one outer transaction open for the module; rolled back once at the end."""
+    module_connection = engine.connect()
+    transaction = module_connection.begin()
+    try:
+        yield module_connection
+    finally:
+        transaction.rollback()
+        module_connection.close()
+
+
+@pytest.fixture(scope="module")
+def seeded_user_and_board(connection):
+    """Seed one user and board per module and return their ids."""
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as db:
+        user = User(username="seeduser", email="seed@example.com", password_hash="hash")
+        db.add(user)
+        db.flush()
+
+        board = Board(name="Seed Board", owner_id=user.id, encrypted_key="testkey")
+        db.add(board)
         db.commit()
+        return user.id, board.id
+
+
+@pytest.fixture
+def simplified_db(connection):
+    """Provide a simplified database session whose writes are rolled back after each test."""
+    savepoint = connection.begin_nested()
+    # Commits inside tests release SAVEPOINTs nested under the per-test one
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
         yield db
     finally:
         db.close()
+        savepoint.rollback()
 
 
 class TestSimplifiedSchema:
     """Test the simplified database schema."""
     
-    def test_schema_complexity_reduction(self):
+    @pytest.mark.parametrize("key,check", [
+        ("total_tables", lambda tables: tables == 6),
+        ("core_tables", lambda tables: len(tables) == 6),
+        ("eliminated_tables", lambda tables: len(tables) == 5),
+        ("benefits", lambda benefits: "60% fewer tables to manage" in benefits),
+    ], ids=["total_tables", "core_tables", "eliminated_tables", "benefits"])
+    def test_schema_info(self, key, check):
         """Test that simplified schema reduces complexity as claimed."""
-        schema_info = get_simplified_schema_info()
-        
-        print("Simplified Schema Analysis:")
-        print(f"  - Total tables: {schema_info['total_tables']}")
-        print(f"  - Core tables: {schema_info['core_tables']}")
-        print(f"  - Eliminated tables: {schema_info['eliminated_tables']}")
-        print("  - Benefits:")
-        for benefit in schema_info['benefits']:
-            print(f"    * {benefit}")
-        
-        # Verify complexity reduction
-        assert schema_info['total_tables'] == 6
-        assert len(schema_info['eliminated_tables']) == 5
-        assert "60% fewer tables to manage" in schema_info['benefits']
+        assert check(get_simplified_schema_info()[key])
     
     def test_integrated_user_avatars(self, simplified_db):
         """Test that user avatars are integrated into users table."""
@@ -79,52 +195,46 @@ class TestSimplifiedSchema:
         simplified_db.commit()
         
         # Query user and verify avatar data
-        retrieved_user = simplified_db.query(User).filter(User.username == "testuser").first()
+        retrieved_user = simplified_db.scalars(select(User).where(User.username == "testuser")).first()
         
         assert retrieved_user is not None
         assert retrieved_user.avatar_url == "https://example.com/avatar.jpg"
         assert retrieved_user.avatar_updated_at is not None
         
-        print("Integrated User Avatars:")
-        print(f"  - User: {retrieved_user.username}")
-        print(f"  - Avatar URL: {retrieved_user.avatar_url}")
-        print(f"  - No separate user_avatars table needed")
-        print("  - Eliminates joins for avatar queries")
+        logger.debug("Integrated User Avatars:")
+        logger.debug("  - User: %s", retrieved_user.username)
+        logger.debug("  - Avatar URL: %s", retrieved_user.avatar_url)
+        logger.debug("  - No separate user_avatars table needed")
+        logger.debug("  - Eliminates joins for avatar queries")
     
-    def test_unified_activity_logging(self, simplified_db):
+    def test_unified_activity_logging(self, simplified_db, seeded_user_and_board):
         """Test that activity_log replaces separate login_history and edit_history."""
-        # Create user and board
-        user = User(username="activityuser", email="activity@example.com", password_hash="hash")
-        simplified_db.add(user)
-        simplified_db.commit()
-        
-        board = Board(name="Test Board", owner_id=user.id, encrypted_key="testkey")
-        simplified_db.add(board)
-        simplified_db.commit()
+        user_id, board_id = seeded_user_and_board
+        now = datetime.now(timezone.utc)
         
         # Create different types of activities
         activities = [
             ActivityLog(
-                user_id=user.id,
+                user_id=user_id,
                 activity_type="login",
                 activity_data='{"success": true}',
                 ip_address="192.168.1.1",
                 user_agent="Mozilla/5.0",
-                expires_at=datetime.now(timezone.utc) + timedelta(days=90)
+                expires_at=now + timedelta(days=90)
             ),
             ActivityLog(
-                user_id=user.id,
-                board_id=board.id,
+                user_id=user_id,
+                board_id=board_id,
                 activity_type="stroke",
                 activity_data='{"stroke_count": 1}',
-                expires_at=datetime.now(timezone.utc) + timedelta(days=30)
+                expires_at=now + timedelta(days=30)
             ),
             ActivityLog(
-                user_id=user.id,
-                board_id=board.id,
+                user_id=user_id,
+                board_id=board_id,
                 activity_type="board_edit",
                 activity_data='{"action": "rename", "old_name": "Old", "new_name": "New"}',
-                expires_at=datetime.now(timezone.utc) + timedelta(days=30)
+                expires_at=now + timedelta(days=30)
             )
         ]
         
@@ -132,259 +242,169 @@ class TestSimplifiedSchema:
         simplified_db.commit()
         
         # Query activities
-        login_activities = simplified_db.query(ActivityLog).filter(
+        login_count = simplified_db.scalar(select(func.count()).select_from(ActivityLog).where(
             ActivityLog.activity_type == "login"
-        ).all()
+        ))
         
-        board_activities = simplified_db.query(ActivityLog).filter(
-            ActivityLog.board_id == board.id
-        ).all()
+        board_count = simplified_db.scalar(select(func.count()).select_from(ActivityLog).where(
+            ActivityLog.board_id == board_id
+        ))
         
-        print("Unified Activity Logging:")
-        print(f"  - Login activities: {len(login_activities)}")
-        print(f"  - Board activities: {len(board_activities)}")
-        print(f"  - Total activities: {len(activities)}")
-        print("  - Replaces separate login_history and edit_history tables")
-        print("  - Single table for all user activities")
-        
-        assert len(login_activities) == 1
-        assert len(board_activities) == 2
-        assert login_activities[0].ip_address == "192.168.1.1"
+        # Only the login row's fields are asserted on, so only it is loaded
+        login_activity = simplified_db.scalars(select(ActivityLog).where(
+            ActivityLog.activity_type == "login"
+        ).limit(1)).first()
+        
+        logger.debug("Unified Activity Logging:")
+        logger.debug("  - Login activities: %s", login_count)
+        logger.debug("  - Board activities: %s", board_count)
+        logger.debug("  - Total activities: %s", len(activities))
+        logger.debug("  - Replaces separate login_history and edit_history tables")
+        logger.debug("  - Single table for all user activities")
+        
+        assert login_count == 1
+        assert board_count == 2
+        assert login_activity.ip_address == "192.168.1.1"
     
-    def test_consolidated_file_uploads(self, simplified_db):
+    def test_consolidated_file_uploads(self, simplified_db, seeded_user_and_board):
         """Test that file_uploads handles templates, exports, and uploads."""
-        # Create user and board
-        user = User(username="fileuser", email="file@example.com", password_hash="hash")
-        simplified_db.add(user)
-        simplified_db.commit()
-        
-        board = Board(name="File Board", owner_id=user.id, encrypted_key="testkey")
-        simplified_db.add(board)
-        simplified_db.commit()
-        
-        # Create different types of file uploads
-        files = [
-            FileUpload(
-                user_id=user.id,
-                filename="template.json",
-                file_path="/uploads/templates/template.json",
-                file_size=1024,
-                mime_type="application/json",
-                upload_type="template",
-                usage_count=5,
-                last_used_at=datetime.now(timezone.utc),
-                expires_at=datetime.now(timezone.utc) + timedelta(days=7)
-            ),
-            FileUpload(
-                user_id=user.id,
-                board_id=board.id,
-                filename="board_export.png",
-                file_path="/uploads/exports/export.png",
-                file_size=2048,
-                mime_type="image/png",
-                upload_type="export",
-                expires_at=datetime.now(timezone.utc) + timedelta(hours=48)
-            ),
-            FileUpload(
-                user_id=user.id,
-                filename="temp_file.tmp",
-                file_path="/uploads/temp/temp.tmp",
-                file_size=512,
-                mime_type="application/octet-stream",
-                upload_type="temporary",
-                expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
-            )
-        ]
-        
-        simplified_db.add_all(files)
-        simplified_db.commit()
-        
-        # Query different file types
-        templates = simplified_db.query(FileUpload).filter(
-            FileUpload.upload_type == "template"
-        ).all()
-        
-        exports = simplified_db.query(FileUpload).filter(
-            FileUpload.upload_type == "export"
-        ).all()
-        
-        temp_files = simplified_db.query(FileUpload).filter(
-            FileUpload.upload_type == "temporary"
-        ).all()
-        
-        print("Consolidated File Uploads:")
-        print(f"  - Templates: {len(templates)}")
-        print(f"  - Exports: {len(exports)}")
-        print(f"  - Temporary files: {len(temp_files)}")
-        print("  - Single table replaces board_templates and separate export tracking")
-        print("  - upload_type field distinguishes file categories")
-        
-        assert len(templates) == 1
-        assert len(exports) == 1
-        assert len(temp_files) == 1
-        assert templates[0].usage_count == 5
+        uploads = add_file_uploads(simplified_db, *seeded_user_and_board, datetime.now(timezone.utc))
+        simplified_db.flush()
+        
+        # One GROUP BY returns the row count for every file category at once
+        counts = dict(simplified_db.execute(
+            select(FileUpload.upload_type, func.count()).group_by(FileUpload.upload_type)
+        ).all())
+        
+        logger.debug("Consolidated File Uploads:")
+        logger.debug("  - Counts by upload_type: %s", counts)
+        logger.debug("  - Single table replaces board_templates and separate export tracking")
+        logger.debug("  - upload_type field distinguishes file categories")
+        
+        assert counts == {"template": 1, "export": 1, "temporary": 1}
+        assert len({upload.id for upload in uploads.values()}) == 3
+        assert uploads["template"].usage_count == 5
+        assert uploads["export"].usage_count == 0
+    
+    @pytest.mark.parametrize("upload_type,ttl,on_board", [
+        ("template", timedelta(days=7), False),
+        ("export", timedelta(hours=48), True),
+        ("temporary", timedelta(hours=1), False),
+    ])
+    def test_file_upload_ttl_and_board(self, simplified_db, seeded_user_and_board, upload_type, ttl, on_board):
+        """Test that each upload type keeps its own TTL and board link in the shared table."""
+        _, board_id = seeded_user_and_board
+        now = datetime.now(timezone.utc)
+        add_file_uploads(simplified_db, *seeded_user_and_board, now)
+        
+        upload = simplified_db.scalars(select(FileUpload).where(FileUpload.upload_type == upload_type)).one()
+        
+        assert upload.expires_at == now + ttl
+        assert (upload.board_id == board_id) == on_board
     
-    def test_ttl_functionality_preserved(self, simplified_db):
+    def test_ttl_functionality_preserved(self, simplified_db, seeded_user_and_board):
         """Test that all TTL functionality is preserved in simplified schema."""
-        # Create user
-        user = User(username="ttluser", email="ttl@example.com", password_hash="hash")
-        simplified_db.add(user)
-        simplified_db.commit()
-        
-        # Create board
-        board = Board(name="TTL Board", owner_id=user.id, encrypted_key="testkey")
-        simplified_db.add(board)
-        simplified_db.commit()
+        user_id, board_id = seeded_user_and_board
         
         # Create data with different TTL requirements
         current_time = datetime.now(timezone.utc)
         
-        # Expired stroke (should be cleaned up)
-        expired_stroke = Stroke(
-            board_id=board.id,
-            user_id=user.id,
-            stroke_data=b"expired_stroke_data",
-            expires_at=current_time - timedelta(hours=1)  # Expired
-        )
-        
-        # Fresh stroke (should not be cleaned up)
-        fresh_stroke = Stroke(
-            board_id=board.id,
-            user_id=user.id,
-            stroke_data=b"fresh_stroke_data",
-            expires_at=current_time + timedelta(hours=23)  # Not expired
-        )
-        
-        # Expired activity
-        expired_activity = ActivityLog(
-            user_id=user.id,
-            activity_type="test",
-            expires_at=current_time - timedelta(hours=1)  # Expired
-        )
-        
-        simplified_db.add_all([expired_stroke, fresh_stroke, expired_activity])
+        # One multi-row INSERT per table, bypassing the unit of work
+        simplified_db.execute(insert(Stroke), [
+            {
+                "board_id": board_id,
+                "user_id": user_id,
+                "stroke_data": b"expired_stroke_data",
+                "expires_at": current_time - timedelta(hours=1)  # Expired
+            },
+            {
+                "board_id": board_id,
+                "user_id": user_id,
+                "stroke_data": b"fresh_stroke_data",
+                "expires_at": current_time + timedelta(hours=23)  # Not expired
+            }
+        ])
+        simplified_db.execute(insert(ActivityLog), [
+            {
+                "user_id": user_id,
+                "activity_type": "test",
+                "expires_at": current_time - timedelta(hours=1)  # Expired
+            }
+        ])
         simplified_db.commit()
         
         # Test TTL queries
-        expired_strokes = simplified_db.query(Stroke).filter(
+        expired_stroke_ids = simplified_db.scalars(select(Stroke.id).where(
             Stroke.expires_at <= current_time
-        ).all()
+        )).all()
         
-        fresh_strokes = simplified_db.query(Stroke).filter(
+        fresh_stroke_count = simplified_db.scalar(select(func.count()).select_from(Stroke).where(
             Stroke.expires_at > current_time
-        ).all()
+        ))
         
-        expired_activities = simplified_db.query(ActivityLog).filter(
+        expired_activity_ids = simplified_db.scalars(select(ActivityLog.id).where(
             ActivityLog.expires_at <= current_time
-        ).all()
-        
-        print("TTL Functionality:")
-        print(f"  - Expired strokes found: {len(expired_strokes)}")
-        print(f"  - Fresh strokes found: {len(fresh_strokes)}")
-        print(f"  - Expired activities found: {len(expired_activities)}")
-        print("  - All TTL functionality preserved in simplified schema")
-        print("  - TTL queries work across all tables")
-        
-        assert len(expired_strokes) == 1
-        assert len(fresh_strokes) == 1
-        assert len(expired_activities) == 1
+        )).all()
+        
+        # Every TTL table range-scans its expires_at index instead of a full scan
+        for table in ("strokes", "activity_log", "file_uploads"):
+            plan = simplified_db.execute(
+                text(f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE expires_at <= :now"),
+                {"now": current_time}
+            ).fetchall()
+            assert f"ix_{table}_expires_at" in " ".join(row[-1] for row in plan)
+        
+        # TTL sweep: one DELETE ... RETURNING per table, no SELECT beforehand
+        swept_ids = sweep_expired(simplified_db, Stroke, current_time)
+        swept_activity_ids = sweep_expired(simplified_db, ActivityLog, current_time)
+        remaining_strokes = simplified_db.scalar(select(func.count()).select_from(Stroke))
+        
+        logger.debug("TTL Functionality:")
+        logger.debug("  - Expired strokes found: %s", len(expired_stroke_ids))
+        logger.debug("  - Expired strokes swept: %s", len(swept_ids))
+        logger.debug("  - Fresh strokes found: %s", fresh_stroke_count)
+        logger.debug("  - Expired activities found: %s", len(expired_activity_ids))
+        logger.debug("  - Expired activities swept: %s", len(swept_activity_ids))
+        logger.debug("  - All TTL functionality preserved in simplified schema")
+        logger.debug("  - TTL queries work across all tables")
+        
+        assert len(expired_stroke_ids) == 1
+        assert fresh_stroke_count == 1
+        assert len(expired_activity_ids) == 1
+        assert swept_ids == expired_stroke_ids
+        assert remaining_strokes == 1
+        assert swept_activity_ids == expired_activity_ids
     
-    def test_query_performance_improvement(self, simplified_db):
+    def test_query_performance_improvement(self, simplified_db, seeded_user_and_board):
         """Test that simplified schema improves query performance."""
-        import time
-        
-        # Create test data
-        user = User(username="perfuser", email="perf@example.com", password_hash="hash")
-        simplified_db.add(user)
-        simplified_db.commit()
-        
-        board = Board(name="Perf Board", owner_id=user.id, encrypted_key="testkey")
-        simplified_db.add(board)
-        simplified_db.commit()
+        user_id, _ = seeded_user_and_board
         
         # Test complex query that would require joins in over-engineered schema
         # In simplified schema: get user with avatar, recent activities, and file uploads
-        start_time = time.time()
-        
-        result = simplified_db.query(User).filter(User.id == user.id).first()
-        user_activities = simplified_db.query(ActivityLog).filter(
-            ActivityLog.user_id == user.id
-        ).limit(10).all()
-        user_files = simplified_db.query(FileUpload).filter(
-            FileUpload.user_id == user.id
-        ).limit(10).all()
-        
-        query_time = time.time() - start_time
-        
-        print("Query Performance:")
-        print(f"  - User query (with avatar): {len([result]) if result else 0} records")
-        print(f"  - User activities: {len(user_activities)} records")
-        print(f"  - User files: {len(user_files)} records")
-        print(f"  - Total query time: {query_time:.4f} seconds")
-        print("  - No complex joins needed (simplified schema benefit)")
-        print("  - Avatar data retrieved directly from user record")
-        
-        # Should be fast with simplified schema
-        assert query_time < 0.01  # Very fast for simple queries
+        with count_queries(simplified_db.connection()) as queries:
+            result = simplified_db.execute(user_graph_query(user_id)).unique().scalar_one()
+            user_activities = result.activities[:10]
+            user_files = result.files[:10]
+        
+        logger.debug("Query Performance:")
+        logger.debug("  - User query (with avatar): %s records", len([result]) if result else 0)
+        logger.debug("  - User activities: %s records", len(user_activities))
+        logger.debug("  - User files: %s records", len(user_files))
+        logger.debug("  - SQL statements issued: %s", len(queries))
+        logger.debug("  - No complex joins needed (simplified schema benefit)")
+        logger.debug("  - Avatar data retrieved directly from user record")
+        
+        # User, activities and files all arrive in a single statement
+        assert len(queries) == 1
         assert result is not None
     
-    def test_maintenance_simplicity(self):
-        """Test that simplified schema is easier to maintain."""
-        schema_info = get_simplified_schema_info()
-        
-        maintenance_benefits = [
-            "Fewer table relationships to manage",
-            "Simpler backup and restore procedures", 
-            "Reduced migration complexity",
-            "Less code needed for CRUD operations",
-            "Unified activity logging simplifies analytics",
-            "Redis handles ephemeral data appropriately"
-        ]
+    @pytest.mark.benchmark
+    def test_user_graph_load_benchmark(self, benchmark, simplified_db, seeded_user_and_board):
+        """Benchmark the joined user/activities/files load with pytest-benchmark."""
+        user_id, _ = seeded_user_and_board
+        # Re-hydrate the identity-mapped user each round so every run does the full load
+        stmt = user_graph_query(user_id).execution_options(populate_existing=True)
         
-        print("Maintenance Simplicity:")
-        print(f"  - Tables reduced from 10 to {schema_info['total_tables']}")
-        print("  - Benefits:")
-        for benefit in maintenance_benefits:
-            print(f"    * {benefit}")
+        result = benchmark(lambda: simplified_db.execute(stmt).unique().scalar_one())
         
-        # Verify simplified maintenance
-        assert schema_info['total_tables'] < 8  # Significantly fewer tables
-        assert len(schema_info['eliminated_tables']) > 3  # Multiple tables consolidated
-
-
-def test_simplified_schema_summary():
-    """Print honest summary of simplified schema benefits."""
-    schema_info = get_simplified_schema_info()
-    
-    print("\n" + "="*60)
-    print("SIMPLIFIED SCHEMA RESULTS")
-    print("="*60)
-    print("HONEST ASSESSMENT of database simplification:")
-    print()
-    print(f"BEFORE (over-engineered): 10 tables")
-    print(f"AFTER (simplified): {schema_info['total_tables']} tables")
-    print(f"REDUCTION: {len(schema_info['eliminated_tables'])} tables eliminated")
-    print()
-    print("CONSOLIDATIONS:")
-    print("- user_avatars -> users.avatar_url (eliminates joins)")
-    print("- login_history + edit_history -> activity_log (unified logging)")
-    print("- board_templates -> file_uploads.upload_type='template'")
-    print("- user_presence -> Redis (appropriate for ephemeral data)")
-    print()
-    print("REAL BENEFITS:")
-    print("- Simpler queries with fewer joins")
-    print("- Easier database maintenance and backup")
-    print("- Better performance for common operations") 
-    print("- More practical for real-world deployment")
-    print("- All essential TTL functionality preserved")
-    print()
-    print("TRADE-OFFS (honest assessment):")
-    print("- Some data denormalization (acceptable for performance)")
-    print("- Redis dependency for user presence")
-    print("- Slightly larger activity_log table (manageable)")
-    print()
-    print("CONCLUSION: Simplified schema is more practical and maintainable")
-    print("while preserving all essential functionality.")
-    print("="*60)
-    
-    assert True  # Summary test always passes
\ No newline at end of file
+        assert result.id == user_id